@@ -1,12 +1,51 @@
 """Nemlig.com API client for authentication, search, and cart operations."""
 
-import uuid
+import base64
+import binascii
+import hashlib
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from itertools import count, islice
+from pathlib import Path
 from typing import Any
 
 import httpx
 
-from .config import API_BASE_URL
+from .config import (
+    API_BASE_URL,
+    GROUP_ID_CACHE_FILE,
+    SEARCH_CACHE_DIR,
+    SESSION_FILE,
+    prune_cache_dir,
+)
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+
+# HTTP/2 is optional (pip install "httpx[http2]")
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 
 class NemligAPIError(Exception):
@@ -17,12 +56,141 @@ class NemligAPIError(Exception):
 
 # External search gateway for autocomplete/quick search
 SEARCH_GATEWAY_URL = "https://webapi.prod.knl.nemlig.it/searchgateway/api"
+SEARCH_GATEWAY_SEARCH_URL = f"{SEARCH_GATEWAY_URL}/search"
+SEARCH_GATEWAY_QUICK_URL = f"{SEARCH_GATEWAY_URL}/quick"
+
+# Connection pool sizing for bursts of searches and cart updates
+HTTP_POOL_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+# Retries for failed connection attempts (DNS, TCP, TLS)
+HTTP_CONNECT_RETRIES = 3
+# Retries for transient HTTP errors. GETs are retried on any of these statuses;
+# POSTs only on 429, where the server has rejected the request unprocessed.
+HTTP_STATUS_RETRIES = 3
+HTTP_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Exponential backoff base and cap in seconds (Retry-After takes precedence)
+HTTP_RETRY_BACKOFF = 0.5
+HTTP_RETRY_MAX_WAIT = 10.0
+# Maximum number of concurrent AddToBasket requests
+MAX_CART_WORKERS = 8
+
+# Static headers for search gateway requests. Content-Type is deliberately
+# absent, as the gateway returns 400 when it is present on GET requests.
+_STATIC_GATEWAY_HEADERS = {
+    "Origin": "https://www.nemlig.com",
+    "Accept": "application/json, text/plain, */*",
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+    "Referer": "https://www.nemlig.com/",
+}
+
+# How long a persisted session (token + timestamps) is reused across runs
+SESSION_TTL = 1800.0
+# Stop reusing a persisted token this many seconds before its JWT expiry
+TOKEN_EXPIRY_MARGIN = 60.0
+
+# In-memory search result cache: entry lifetime in seconds and maximum entries
+SEARCH_CACHE_TTL = 300.0
+SEARCH_CACHE_SIZE = 256
+# On-disk search result cache shared across runs. Entries are keyed by the session's
+# timeslot, user and catalog timestamp, but prices can still be up to this old.
+SEARCH_DISK_CACHE_TTL = 6 * 60 * 60.0
+# Most search result files kept on disk; the least recently used are pruned first
+SEARCH_DISK_CACHE_SIZE = 1000
+
+# Lowercase tokens used by _parse_products to classify products
+_ORGANIC_TOKEN = "øko"
+_LACTOSE_TOKEN = "laktosefri"
+_GLUTEN_TOKEN = "glutenfri"
+_VEGAN_TOKEN = "vegan"
+_FROST_TOKEN = "frost"
+_KOEL_TOKEN = "køl"
+_MEJERI_TOKEN = "mejeri"
+_DAIRY_KEYWORDS = frozenset(("mælk", "ost", "fløde", "yoghurt", "smør", "skyr"))
+
+_LABEL_RE = re.compile(f"({_ORGANIC_TOKEN}|{_LACTOSE_TOKEN}|{_GLUTEN_TOKEN}|{_VEGAN_TOKEN})")
+_DAIRY_SUBCAT_RE = re.compile("|".join(sorted(_DAIRY_KEYWORDS)))
+
+
+class _RetryTransport(httpx.HTTPTransport):
+    """HTTP transport that retries rate-limited and transient server errors."""
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            response = super().handle_request(request)
+            if (
+                attempt >= HTTP_STATUS_RETRIES
+                or response.status_code not in HTTP_RETRY_STATUSES
+                or (request.method != "GET" and response.status_code != 429)
+            ):
+                return response
+            response.close()
+            time.sleep(_retry_wait(response, attempt))
+            attempt += 1
+
+
+def _retry_wait(response: httpx.Response, attempt: int) -> float:
+    """Get the delay before retrying, honouring a numeric Retry-After header."""
+    try:
+        wait = float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        wait = HTTP_RETRY_BACKOFF * 2**attempt
+    return min(max(wait, 0.0), HTTP_RETRY_MAX_WAIT)
+
+
+def _build_transport(http2: bool = False) -> httpx.HTTPTransport:
+    """Create a pooled keep-alive transport for the API clients."""
+    return _RetryTransport(
+        limits=HTTP_POOL_LIMITS, retries=HTTP_CONNECT_RETRIES, http2=http2 and HTTP2_AVAILABLE
+    )
+
+
+# Search cache key: (query, limit, timeslot, user ID, combined timestamp)
+_SearchKey = tuple[str, int, str, str, str]
+
+
+def _search_cache_path(key: _SearchKey) -> Path:
+    """Get the on-disk cache file for a search key."""
+    digest = hashlib.sha1("\n".join(map(str, key)).encode()).hexdigest()
+    return SEARCH_CACHE_DIR / f"{digest}.json"
+
+
+def _load_cached_search(key: _SearchKey) -> list[dict[str, Any]] | None:
+    """Load cached search results from disk if present and not expired."""
+    path = _search_cache_path(key)
+    try:
+        data = _json_loads(path.read_bytes())
+        if time.time() - data["cached_at"] > SEARCH_DISK_CACHE_TTL:
+            path.unlink()
+            return None
+        products = data["products"]
+        if not isinstance(products, list):
+            return None
+        # Mark the entry as recently used for prune_cache_dir()
+        os.utime(path)
+        return products
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _store_cached_search(key: _SearchKey, products: list[dict[str, Any]]) -> None:
+    """Write search results to the disk cache, ignoring filesystem errors."""
+    try:
+        SEARCH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _search_cache_path(key).write_bytes(
+            _json_dumps({"cached_at": time.time(), "products": products})
+        )
+    except (OSError, TypeError):
+        return
+    # Keys include the daily timeslot, so old entries are never read again
+    prune_cache_dir(SEARCH_CACHE_DIR, SEARCH_DISK_CACHE_TTL, SEARCH_DISK_CACHE_SIZE)
 
 
 class NemligAPI:
     """Client for interacting with Nemlig.com's API."""
 
     def __init__(self):
+        # Accept-Encoding is left to httpx, which advertises Brotli ("br")
+        # alongside gzip/deflate when a Brotli decoder is installed
         self.client = httpx.Client(
             headers={
                 "Content-Type": "application/json",
@@ -35,19 +203,55 @@ class NemligAPI:
             },
             follow_redirects=True,
             timeout=30.0,
+            transport=_build_transport(),
+        )
+        # Separate keep-alive client for the search gateway, which rejects
+        # requests carrying the main client's Content-Type header. Concurrent
+        # gateway lookups share one connection when HTTP/2 is available.
+        self._gateway_client = httpx.Client(
+            headers=_STATIC_GATEWAY_HEADERS,
+            timeout=30.0,
+            transport=_build_transport(http2=True),
         )
         self._logged_in = False
+        # Whether refreshed sessions (including the bearer token) are written to SESSION_FILE
+        self.persist_session = True
         self._access_token: str | None = None
+        self._auth_header: str | None = None
         self._user_id: str | None = None
         self._combined_timestamp: str | None = None
         self._timeslot: str = self._generate_default_timeslot()
         self._timeslot_id: int = 0
         self._correlation_id: str | None = None
-
-    def __del__(self):
-        """Close the HTTP client on cleanup."""
+        # Correlation IDs are a random per-client prefix plus a counter, laid out like a UUID
+        prefix = secrets.token_hex(10)
+        self._correlation_prefix = f"{prefix[:8]}-{prefix[8:12]}-{prefix[12:16]}-{prefix[16:]}-"
+        self._correlation_counter = count()
+        self._search_cache: OrderedDict[_SearchKey, tuple[float, list[dict[str, Any]]]] = (
+            OrderedDict()
+        )
+        # Category URL -> [SitecorePublishedStamp, ProductGroupId], loaded lazily
+        self._group_ids: dict[str, list[Any]] | None = None
+        self._group_ids_lock = threading.Lock()
+        self._products_prefix = ""
+        self._products_url_cache: dict[str, str] = {}
+        self._gateway_params: dict[str, Any] = {}
+        # Set once a token and timestamps are available; guarded by _session_lock
+        self._session_lock = threading.Lock()
+        self._session_ready = threading.Event()
+        self._restore_session()
+        self._update_request_templates()
+
+    def close(self) -> None:
+        """Close the HTTP clients and their pooled connections."""
         if hasattr(self, "client"):
             self.client.close()
+        if hasattr(self, "_gateway_client"):
+            self._gateway_client.close()
+
+    def __del__(self):
+        """Close the HTTP clients on cleanup."""
+        self.close()
 
     @staticmethod
     def _generate_default_timeslot() -> str:
@@ -60,13 +264,18 @@ class NemligAPI:
         # Format: YYYYMMDDHH where HH is the delivery hour (15:00)
         return tomorrow.strftime("%Y%m%d") + "15-60-240"
 
+    @staticmethod
+    def _json(response: httpx.Response) -> Any:
+        """Decode a JSON response body, using orjson when it is installed."""
+        return _json_loads(response.content)
+
     def _get_token(self) -> str | None:
         """Get JWT access token from Nemlig.com."""
         url = f"{API_BASE_URL}/Token"
         try:
             response = self.client.get(url)
             response.raise_for_status()
-            data = response.json()
+            data = self._json(response)
             return data.get("access_token")
         except (httpx.RequestError, httpx.HTTPStatusError):
             return None
@@ -80,7 +289,7 @@ class NemligAPI:
         try:
             response = self.client.get(url)
             response.raise_for_status()
-            return response.json()
+            return self._json(response)
         except httpx.RequestError:
             return {}
         except httpx.HTTPStatusError:
@@ -92,7 +301,7 @@ class NemligAPI:
         try:
             response = self.client.get(url)
             response.raise_for_status()
-            data = response.json()
+            data = self._json(response)
             # API might return a string or dict depending on auth state
             if isinstance(data, dict):
                 return data
@@ -108,7 +317,7 @@ class NemligAPI:
         try:
             response = self.client.get(url)
             response.raise_for_status()
-            data = response.json()
+            data = self._json(response)
             if isinstance(data, dict):
                 timeslot_utc = data.get("TimeslotUtc", self._timeslot)
                 timeslot_id = int(data.get("TimeslotId", self._timeslot_id))
@@ -123,31 +332,173 @@ class NemligAPI:
         self._access_token = self._get_token()
 
         # Add Authorization header to client for all subsequent requests
-        if self._access_token:
-            self.client.headers["Authorization"] = f"Bearer {self._access_token}"
+        self._auth_header = f"Bearer {self._access_token}" if self._access_token else None
+        if self._auth_header:
+            self.client.headers["Authorization"] = self._auth_header
+
+        # The remaining lookups only depend on the token, so fetch them concurrently
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            settings_future = executor.submit(self._get_app_settings)
+            user_future = executor.submit(self._get_current_user)
+            timeslot_future = executor.submit(self._get_timeslot)
 
         # Get app settings for timestamps
-        settings = self._get_app_settings()
+        settings = settings_future.result()
         self._combined_timestamp = settings.get(
             "CombinedProductsAndSitecoreTimestamp", "AAAAAAAA-YFA_17hS"
         )
         self._correlation_id = settings.get("SitecorePublishedStamp", "YFA_17hS")
 
         # Get user ID if logged in - it's in DebitorId field
-        user_data = self._get_current_user()
-        if isinstance(user_data, dict):
-            # Try DebitorId first (main user ID), then Id as fallback
-            debitor_id = user_data.get("DebitorId") or user_data.get("Id")
-            if debitor_id:
-                self._user_id = str(debitor_id)
+        # (_get_current_user already normalises non-dict responses to {})
+        user_data = user_future.result()
+        # Try DebitorId first (main user ID), then Id as fallback
+        debitor_id = user_data.get("DebitorId") or user_data.get("Id")
+        if debitor_id:
+            self._user_id = str(debitor_id)
 
         # Get timeslot and timeslot ID
-        self._timeslot, self._timeslot_id = self._get_timeslot()
+        self._timeslot, self._timeslot_id = timeslot_future.result()
+
+        self._update_request_templates()
+        if self._access_token:
+            self._save_session()
+            self._session_ready.set()
+
+    def _ensure_session(self) -> None:
+        """Refresh session data unless a token and timestamps are already available.
+
+        Concurrent callers wait for a single refresh instead of each starting one.
+        """
+        if self._session_ready.is_set():
+            return
+        with self._session_lock:
+            if not self._session_ready.is_set():
+                self._refresh_session_data()
+
+    def _send_with_session(self, send: Callable[[], httpx.Response]) -> httpx.Response:
+        """Send a session-scoped request, refreshing once if the server rejects the session.
+
+        ``send`` is called again after a refresh, so it must rebuild any
+        session-dependent URL, parameters and headers.
+        """
+        token = self._access_token
+        response = send()
+        if response.status_code in (401, 403):
+            self._discard_session(token)
+            self._ensure_session()
+            response = send()
+        return response
+
+    def _discard_session(self, token: str | None) -> None:
+        """Forget a rejected session so the next _ensure_session() fetches a new one."""
+        with self._session_lock:
+            # Another thread may already have replaced the rejected token
+            if self._access_token != token:
+                return
+            self._session_ready.clear()
+            try:
+                SESSION_FILE.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    def _save_session(self) -> None:
+        """Persist the session data so later runs can skip the bootstrap requests."""
+        if not self.persist_session:
+            return
+        session = {
+            "access_token": self._access_token,
+            "combined_timestamp": self._combined_timestamp,
+            "correlation_id": self._correlation_id,
+            "user_id": self._user_id,
+            "timeslot": self._timeslot,
+            "timeslot_id": self._timeslot_id,
+            "expires_at": self._session_expiry(self._access_token),
+        }
+        try:
+            SESSION_FILE.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(SESSION_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump(session, f)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _session_expiry(token: str | None) -> float:
+        """Get when a persisted session should expire, honouring the JWT ``exp`` claim."""
+        expires_at = time.time() + SESSION_TTL
+        if not token:
+            return expires_at
+        try:
+            payload = token.split(".")[1]
+            claims = _json_loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+            exp = float(claims["exp"])
+        except (IndexError, KeyError, TypeError, ValueError, binascii.Error):
+            return expires_at
+        return min(expires_at, exp - TOKEN_EXPIRY_MARGIN)
+
+    @staticmethod
+    def _is_valid_session(session: Any) -> bool:
+        """Check that persisted session data has the fields and types _save_session writes."""
+        if not isinstance(session, dict):
+            return False
+        expires_at = session.get("expires_at")
+        timeslot_id = session.get("timeslot_id", 0)
+        if isinstance(expires_at, bool) or not isinstance(expires_at, (int, float)):
+            return False
+        if isinstance(timeslot_id, bool) or not isinstance(timeslot_id, int):
+            return False
+        for field in ("access_token", "combined_timestamp"):
+            if not isinstance(session.get(field), str) or not session[field]:
+                return False
+        return all(
+            session.get(field) is None or isinstance(session[field], str)
+            for field in ("correlation_id", "user_id", "timeslot")
+        )
+
+    def _restore_session(self) -> None:
+        """Restore session data persisted by a previous run, if still valid."""
+        try:
+            session = _json_loads(SESSION_FILE.read_bytes())
+        except (OSError, ValueError):
+            return
+        if not self._is_valid_session(session) or session["expires_at"] <= time.time():
+            return
+
+        self._access_token = session["access_token"]
+        self._auth_header = f"Bearer {self._access_token}"
+        self.client.headers["Authorization"] = self._auth_header
+        self._combined_timestamp = session["combined_timestamp"]
+        self._correlation_id = session.get("correlation_id")
+        self._user_id = session.get("user_id")
+        self._timeslot = session.get("timeslot") or self._timeslot
+        self._timeslot_id = session.get("timeslot_id", 0)
+        self._session_ready.set()
+
+    def _update_request_templates(self) -> None:
+        """Cache the URL prefix and query parameters that are fixed for the session."""
+        user_id = self._user_id or "0"
+        self._products_prefix = (
+            f"{API_BASE_URL}/{self._combined_timestamp}/{self._timeslot}/1/{user_id}/"
+        )
+        self._products_url_cache = {}
+        self._gateway_params = {
+            "skip": 0,
+            "recipeCount": 0,
+            "timestamp": self._combined_timestamp,
+            "timeslotUtc": self._timeslot,
+            "deliveryZoneId": 1,
+            "includeFavorites": user_id,
+            "TimeSlotId": self._timeslot_id,
+        }
 
     def _build_products_url(self, endpoint: str) -> str:
         """Build the products API URL with timestamps and user ID."""
-        user_id = self._user_id or "0"
-        return f"{API_BASE_URL}/{self._combined_timestamp}/{self._timeslot}/1/{user_id}/{endpoint}"
+        url = self._products_url_cache.get(endpoint)
+        if url is None:
+            url = self._products_prefix + endpoint
+            self._products_url_cache[endpoint] = url
+        return url
 
     def login(self, username: str, password: str) -> bool:
         """
@@ -167,10 +518,10 @@ class NemligAPI:
         payload = {"Username": username, "Password": password}
 
         try:
-            response = self.client.post(url, json=payload)
+            response = self.client.post(url, content=_json_dumps(payload))
             response.raise_for_status()
 
-            data = response.json()
+            data = self._json(response)
             # Successful login returns RedirectUrl, failed returns ErrorCode
             if data.get("RedirectUrl") or data.get("MergeSuccessful"):
                 self._logged_in = True
@@ -194,21 +545,52 @@ class NemligAPI:
         """Check if currently logged in."""
         return self._logged_in
 
-    def search_products(self, query: str, limit: int = 10) -> list[dict[str, Any]]:
+    def search_products(
+        self, query: str, limit: int = 10, use_cache: bool = True
+    ) -> list[dict[str, Any]]:
         """
         Search for products on Nemlig.com.
 
         Args:
             query: Search term
             limit: Maximum number of results
+            use_cache: Return cached results if available (fresh results are
+                cached either way)
 
         Returns:
             List of product dictionaries with id, name, price, unit, etc.
         """
-        # Ensure we have session data
-        if not self._combined_timestamp:
-            self._refresh_session_data()
+        # Availability and favourites depend on the session, so key on it too
+        self._ensure_session()
+        key = (
+            query.lower().strip(),
+            limit,
+            self._timeslot,
+            self._user_id or "",
+            self._combined_timestamp or "",
+        )
+        cached = self._search_cache.get(key) if use_cache else None
+        if cached and time.monotonic() - cached[0] < SEARCH_CACHE_TTL:
+            return list(cached[1])
+
+        products = _load_cached_search(key) if use_cache else None
+        if products is None:
+            products = self._search_uncached(query, limit)
+            if products:
+                _store_cached_search(key, products)
+        if products:
+            self._search_cache[key] = (time.monotonic(), products)
+            self._search_cache.move_to_end(key)
+            while len(self._search_cache) > SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+        return list(products)
 
+    def _search_uncached(self, query: str, limit: int) -> list[dict[str, Any]]:
+        """Search for products without consulting the result cache.
+
+        The caller must already have run _ensure_session(); a failed refresh is
+        not retried here.
+        """
         # Try the search gateway (primary method)
         products = self._search_via_gateway(query, limit)
         if products:
@@ -217,20 +599,34 @@ class NemligAPI:
         # Fallback: Try fetching from first matching category via quick search
         if self._access_token:
             categories = self._get_search_categories(query)
-            if categories:
-                # Try to get products from the first matching category
-                for cat in categories[:3]:
-                    cat_url = cat.get("Url", "")
-                    if cat_url:
-                        products = self.get_products_by_category(cat_url, limit)
-                        if products:
-                            return products
+            cat_urls = [cat["Url"] for cat in categories[:3] if cat.get("Url")]
+            if cat_urls:
+                # Fetch the top categories concurrently, then return products
+                # from the first one (in relevance order) that has any
+                with ThreadPoolExecutor(max_workers=len(cat_urls)) as executor:
+                    results = list(
+                        executor.map(
+                            lambda cat_url: self._get_products_by_category(cat_url, limit),
+                            cat_urls,
+                        )
+                    )
+                for products in results:
+                    if products:
+                        return products
 
         return []
 
+    def _next_correlation_id(self) -> str:
+        """Return a unique UUID-formatted correlation ID.
+
+        The server only logs this value, so uniqueness within the client is
+        enough and no randomness is needed per request.
+        """
+        return f"{self._correlation_prefix}{next(self._correlation_counter):012x}"
+
     def _get_correlation_headers(self) -> dict[str, str]:
         """Generate headers with a unique X-Correlation-Id for each request."""
-        return {"X-Correlation-Id": str(uuid.uuid4())}
+        return {"X-Correlation-Id": self._next_correlation_id()}
 
     def _get_gateway_headers(self) -> dict[str, str]:
         """Generate headers for search gateway requests.
@@ -238,47 +634,32 @@ class NemligAPI:
         Note: We explicitly exclude Content-Type for GET requests to the search gateway,
         as it causes a 400 error when present.
         """
-        headers = {
-            "X-Correlation-Id": str(uuid.uuid4()),
-            "Origin": "https://www.nemlig.com",
-            "Accept": "application/json, text/plain, */*",
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-            "Referer": "https://www.nemlig.com/",
-        }
-        if self._access_token:
-            headers["Authorization"] = f"Bearer {self._access_token}"
+        # Static headers (Origin, Accept, User-Agent, Referer) live on _gateway_client
+        headers = {"X-Correlation-Id": self._next_correlation_id()}
+        if self._auth_header:
+            headers["Authorization"] = self._auth_header
         return headers
 
     def _search_via_gateway(self, query: str, limit: int) -> list[dict[str, Any]]:
         """Search products using the search gateway API."""
-        # Ensure we have required data for the gateway
-        if not self._access_token or not self._combined_timestamp:
-            self._refresh_session_data()
-            if not self._access_token:
-                return []
-
-        url = f"{SEARCH_GATEWAY_URL}/search"
-        params = {
-            "query": query,
-            "take": limit,
-            "skip": 0,
-            "recipeCount": 0,
-            "timestamp": self._combined_timestamp,
-            "timeslotUtc": self._timeslot,
-            "deliveryZoneId": 1,
-            "includeFavorites": self._user_id or "0",
-            "TimeSlotId": self._timeslot_id,
-        }
+        # The gateway requires a token
+        if not self._access_token:
+            return []
 
         try:
-            # Use httpx.get directly to avoid client's Content-Type header
-            # which causes 400 errors on the search gateway
-            response = httpx.get(
-                url, params=params, headers=self._get_gateway_headers(), timeout=30.0
+            # Use the gateway client to avoid the main client's Content-Type
+            # header, which causes 400 errors on the search gateway
+            response = self._send_with_session(
+                lambda: self._gateway_client.get(
+                    SEARCH_GATEWAY_SEARCH_URL,
+                    params={"query": query, "take": limit, **self._gateway_params},
+                    headers=self._get_gateway_headers(),
+                )
             )
-            response.raise_for_status()
+            if not response.is_success:
+                return []
 
-            data = response.json()
+            data = self._json(response)
             # The search gateway returns Products as a dict with nested Products list
             products_data = data.get("Products", {})
             if isinstance(products_data, dict):
@@ -287,21 +668,26 @@ class NemligAPI:
                 products_list = products_data if isinstance(products_data, list) else []
             return self._parse_products(products_list, limit)
 
-        except (httpx.RequestError, httpx.HTTPStatusError):
+        except httpx.RequestError:
             return []
 
+    def _quick_search(self, query: str) -> httpx.Response:
+        """Send a quick search gateway request for category and text suggestions."""
+        return self._gateway_client.get(
+            SEARCH_GATEWAY_QUICK_URL,
+            params={"query": query, "correlationId": self._correlation_id or ""},
+            headers=self._get_gateway_headers(),
+        )
+
     def _get_search_categories(self, query: str) -> list[dict[str, Any]]:
         """Get category suggestions from the quick search gateway."""
-        url = f"{SEARCH_GATEWAY_URL}/quick"
-        params = {"query": query, "correlationId": self._correlation_id or ""}
-        headers = self._get_gateway_headers()
-
         try:
-            response = self.client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            data = response.json()
+            response = self._send_with_session(lambda: self._quick_search(query))
+            if not response.is_success:
+                return []
+            data = self._json(response)
             return data.get("Categories", [])
-        except (httpx.RequestError, httpx.HTTPStatusError):
+        except httpx.RequestError:
             return []
 
     def get_search_suggestions(self, query: str) -> dict[str, Any]:
@@ -314,32 +700,25 @@ class NemligAPI:
         Returns:
             Dict with 'suggestions' (list of strings) and 'categories' (list of dicts)
         """
-        if not self._access_token:
-            self._refresh_session_data()
-
-        url = f"{SEARCH_GATEWAY_URL}/quick"
-        params = {"query": query, "correlationId": self._correlation_id or ""}
-        headers = self._get_gateway_headers()
+        self._ensure_session()
 
         try:
-            response = self.client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            data = response.json()
+            response = self._send_with_session(lambda: self._quick_search(query))
+            if not response.is_success:
+                return {"suggestions": [], "categories": []}
+            data = self._json(response)
             return {
                 "suggestions": data.get("Suggestions", []),
                 "categories": data.get("Categories", []),
             }
-        except (httpx.RequestError, httpx.HTTPStatusError):
+        except httpx.RequestError:
             return {"suggestions": [], "categories": []}
 
     def _parse_products(self, products_data: list[dict], limit: int) -> list[dict[str, Any]]:
         """Parse product data from API response into standardized format."""
         products = []
 
-        # Keywords for dairy detection
-        dairy_keywords = {"mælk", "ost", "fløde", "yoghurt", "smør", "skyr"}
-
-        for item in products_data[:limit]:
+        for item in islice(products_data, limit):
             # Extract availability info
             availability = item.get("Availability", {})
             is_available = availability.get("IsDeliveryAvailable", True) and availability.get(
@@ -350,18 +729,22 @@ class NemligAPI:
             category = item.get("Category", "") or ""
             subcategory = item.get("SubCategory", "") or ""
             labels = item.get("Labels", []) or []
-            labels_lower = [lbl.lower() if isinstance(lbl, str) else "" for lbl in labels]
+            # Join labels with a separator that can't occur in a match, so a
+            # single regex pass finds every label token
+            labels_blob = "\u0001".join(lbl.lower() for lbl in labels if isinstance(lbl, str))
+            label_hits = {m.group(1) for m in _LABEL_RE.finditer(labels_blob)}
 
             # Determine product attributes from category and labels
-            is_organic = any("øko" in lbl for lbl in labels_lower)
-            is_frozen = category.lower() == "frost"
-            is_refrigerated = category.lower() == "køl"
-            is_dairy = "mejeri" in category.lower() or any(
-                kw in subcategory.lower() for kw in dairy_keywords
+            category_lower = category.lower()
+            is_organic = _ORGANIC_TOKEN in label_hits
+            is_frozen = category_lower == _FROST_TOKEN
+            is_refrigerated = category_lower == _KOEL_TOKEN
+            is_dairy = _MEJERI_TOKEN in category_lower or bool(
+                _DAIRY_SUBCAT_RE.search(subcategory.lower())
             )
-            is_lactose_free = any("laktosefri" in lbl for lbl in labels_lower)
-            is_gluten_free = any("glutenfri" in lbl for lbl in labels_lower)
-            is_vegan = any("vegan" in lbl for lbl in labels_lower)
+            is_lactose_free = _LACTOSE_TOKEN in label_hits
+            is_gluten_free = _GLUTEN_TOKEN in label_hits
+            is_vegan = _VEGAN_TOKEN in label_hits
             is_on_discount = item.get("DiscountItem", False) or item.get("IsDiscountItem", False)
 
             products.append(
@@ -402,11 +785,23 @@ class NemligAPI:
         Returns:
             List of product dictionaries
         """
-        # Ensure we have session data
-        if not self._combined_timestamp:
-            self._refresh_session_data()
-
-        # First, get the category page to find the productGroupId
+        self._ensure_session()
+        return self._get_products_by_category(category_url, limit)
+
+    def _get_products_by_category(self, category_url: str, limit: int) -> list[dict[str, Any]]:
+        """Get products from a category without refreshing the session first."""
+        group_id = self._resolve_group_id(category_url)
+        return self._get_products_by_group_id(group_id, limit) if group_id else []
+
+    def _resolve_group_id(self, category_url: str) -> Any | None:
+        """Find the ProductGroupId behind a category page, using the disk cache if possible."""
+        # Category -> group mappings only change when the catalog is republished
+        stamp = self._correlation_id or ""
+        cached = self._load_group_ids().get(category_url)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+        # Fetch the category page to find the productGroupId
         page_url = f"https://www.nemlig.com{category_url}"
         params = {"GetAsJson": "1"}
 
@@ -414,31 +809,67 @@ class NemligAPI:
             response = self.client.get(page_url, params=params)
             response.raise_for_status()
 
-            data = response.json()
+            data = self._json(response)
             # Look for product group ID in the page content
             content = data.get("content", [])
             for item in content:
                 if item.get("ProductGroupId"):
-                    return self._get_products_by_group_id(item["ProductGroupId"], limit)
+                    self._remember_group_id(category_url, stamp, item["ProductGroupId"])
+                    return item["ProductGroupId"]
 
         except (httpx.RequestError, httpx.HTTPStatusError):
             pass
 
-        return []
+        return None
+
+    def _load_group_ids(self) -> dict[str, list[Any]]:
+        """Load the category URL -> ProductGroupId cache from disk on first use."""
+        with self._group_ids_lock:
+            if self._group_ids is None:
+                try:
+                    data = _json_loads(GROUP_ID_CACHE_FILE.read_bytes())
+                except (OSError, ValueError):
+                    data = {}
+                if not isinstance(data, dict):
+                    data = {}
+                # Keep only well-formed [stamp, group_id] entries
+                self._group_ids = {
+                    url: entry
+                    for url, entry in data.items()
+                    if isinstance(entry, list) and len(entry) == 2 and isinstance(entry[0], str)
+                }
+            return self._group_ids
+
+    def _remember_group_id(self, category_url: str, stamp: str, group_id: Any) -> None:
+        """Cache a category's ProductGroupId for the given catalog publish stamp."""
+        group_ids = self._load_group_ids()
+        with self._group_ids_lock:
+            group_ids[category_url] = [stamp, group_id]
+            try:
+                GROUP_ID_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+                GROUP_ID_CACHE_FILE.write_text(json.dumps(group_ids))
+            except OSError:
+                pass
 
     def _get_products_by_group_id(self, group_id: str, limit: int) -> list[dict[str, Any]]:
         """Get products by product group ID."""
-        url = self._build_products_url("Products/GetByProductGroupId")
         params = {"productGroupId": group_id, "sortorder": "default", "take": limit}
 
         try:
-            response = self.client.get(url, params=params, headers=self._get_correlation_headers())
-            response.raise_for_status()
+            response = self._send_with_session(
+                lambda: self.client.get(
+                    self._build_products_url("Products/GetByProductGroupId"),
+                    params=params,
+                    headers=self._get_correlation_headers(),
+                )
+            )
+            if not response.is_success:
+                return []
 
-            data = response.json()
+            data = self._json(response)
             return self._parse_products(data.get("Products", []), limit)
 
-        except (httpx.RequestError, httpx.HTTPStatusError):
+        except httpx.RequestError:
             return []
 
     def add_to_cart(self, product_id: int | str, quantity: int = 1) -> bool:
@@ -462,7 +893,7 @@ class NemligAPI:
         payload = {"ProductId": int(product_id), "Quantity": quantity}
 
         try:
-            response = self.client.post(url, json=payload)
+            response = self.client.post(url, content=_json_dumps(payload))
             response.raise_for_status()
             return True
 
@@ -483,19 +914,31 @@ class NemligAPI:
         """
         results: dict[str, list] = {"success": [], "failed": []}
 
-        for item in items:
-            product_id = item.get("product_id")
-            quantity = item.get("quantity", 1)
-
-            if product_id is None:
-                results["failed"].append({"product_id": None, "error": "Missing product_id"})
-                continue
-
-            try:
-                self.add_to_cart(product_id, quantity)
-                results["success"].append(product_id)
-            except NemligAPIError as e:
-                results["failed"].append({"product_id": product_id, "error": str(e)})
+        # Cart additions are independent, so issue them concurrently over the
+        # pooled client and collect results in input order
+        workers = max(1, min(MAX_CART_WORKERS, len(items)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures: list[tuple[Any, Future | None]] = []
+            for item in items:
+                product_id = item.get("product_id")
+                if product_id is None:
+                    futures.append((None, None))
+                    continue
+                quantity = item.get("quantity", 1)
+                futures.append(
+                    (product_id, executor.submit(self.add_to_cart, product_id, quantity))
+                )
+
+            for product_id, future in futures:
+                if future is None:
+                    results["failed"].append({"product_id": None, "error": "Missing product_id"})
+                    continue
+
+                try:
+                    future.result()
+                    results["success"].append(product_id)
+                except NemligAPIError as e:
+                    results["failed"].append({"product_id": product_id, "error": str(e)})
 
         return results
 
@@ -514,7 +957,7 @@ class NemligAPI:
         try:
             response = self.client.get(url)
             response.raise_for_status()
-            return response.json()
+            return self._json(response)
 
         except httpx.RequestError as e:
             raise NemligAPIError(f"Failed to get cart: {e}") from e
@@ -1,20 +1,43 @@
 """CLI entry point for Nemlig Shopper."""
 
+import atexit
+
 import click
 
 from .api import NemligAPI, NemligAPIError
-from .config import clear_credentials, get_credentials, save_credentials
+from .config import (
+    clear_credentials,
+    clear_recipe_cache,
+    clear_search_cache,
+    clear_session,
+    get_credentials,
+    save_credentials,
+)
 from .recipe_parser import parse_recipe_text, parse_recipe_url
 
 # Shared API instance
 _api: NemligAPI | None = None
 
+# Product flags shown as [tags] in search results, in display order
+PRODUCT_LABELS = (
+    ("is_refrigerated", "Køl"),
+    ("is_frozen", "Frost"),
+    ("is_organic", "Øko"),
+    ("is_dairy", "Dairy"),
+    ("is_lactose_free", "Laktosefri"),
+    ("is_gluten_free", "Glutenfri"),
+    ("is_vegan", "Vegan"),
+    ("is_on_discount", "Tilbud"),
+)
+
 
 def get_api() -> NemligAPI:
     """Get or create the API instance."""
     global _api
     if _api is None:
         _api = NemligAPI()
+        # Drain pooled connections at exit rather than relying on __del__
+        atexit.register(_api.close)
     return _api
 
 
@@ -64,6 +87,10 @@ def cli():
 def login(username: str, password: str, save: bool):
     """Log in to Nemlig.com."""
     api = get_api()
+    if not save:
+        # Keep the session token out of the cache as well as the credentials
+        api.persist_session = False
+        clear_session()
 
     try:
         api.login(username, password)
@@ -79,9 +106,11 @@ def login(username: str, password: str, save: bool):
 
 @cli.command()
 def logout():
-    """Clear saved credentials."""
+    """Clear saved credentials, the cached session and cached search results."""
     clear_credentials()
-    click.echo("✓ Credentials cleared")
+    clear_session()
+    clear_search_cache()
+    click.echo("✓ Credentials, session and search cache cleared")
 
 
 # ============================================================================
@@ -94,11 +123,13 @@ def logout():
 @click.option("--text", "-t", "input_text", help="Parse ingredients from text instead of URL")
 @click.option("--title", help="Recipe title (for text input)")
 @click.option("--servings", "-S", type=int, help="Servings (for text input)")
+@click.option("--no-cache", is_flag=True, help="Re-fetch the recipe instead of using the cache")
 def parse_recipe_cmd(
     url: str | None,
     input_text: str | None,
     title: str | None,
     servings: int | None,
+    no_cache: bool,
 ):
     """Parse a recipe from URL or text and display ingredients.
 
@@ -120,7 +151,7 @@ def parse_recipe_cmd(
     try:
         if url:
             click.echo(f"Parsing recipe from: {url}")
-            recipe = parse_recipe_url(url)
+            recipe = parse_recipe_url(url, use_cache=not no_cache)
         else:
             assert input_text is not None
             # Handle comma-separated input
@@ -129,11 +160,8 @@ def parse_recipe_cmd(
             recipe = parse_recipe_text(title or "Manual Recipe", input_text, servings)
 
         # Display recipe
-        click.echo()
         servings_str = f" ({recipe.servings} servings)" if recipe.servings else ""
-        click.echo(f"Recipe: {recipe.title}{servings_str}")
-        click.echo()
-        click.echo("Ingredients:")
+        lines = ["", f"Recipe: {recipe.title}{servings_str}", "", "Ingredients:"]
         for ing in recipe.ingredients:
             # Format: quantity unit name
             qty_str = ""
@@ -141,7 +169,8 @@ def parse_recipe_cmd(
                 qty_str = f"{ing.quantity:g}" if ing.quantity % 1 == 0 else f"{ing.quantity:.2f}"
             unit_str = f" {ing.unit}" if ing.unit else ""
             qty_unit = f"{qty_str}{unit_str}".ljust(8) if qty_str else "".ljust(8)
-            click.echo(f"  {qty_unit} {ing.name}")
+            lines.append(f"  {qty_unit} {ing.name}")
+        click.echo("\n".join(lines))
 
     except ImportError as e:
         click.echo(f"✗ {e}", err=True)
@@ -159,7 +188,8 @@ def parse_recipe_cmd(
 @cli.command()
 @click.argument("query")
 @click.option("--limit", "-l", default=10, help="Maximum results to show")
-def search(query: str, limit: int):
+@click.option("--no-cache", is_flag=True, help="Query Nemlig instead of using cached results")
+def search(query: str, limit: int, no_cache: bool):
     """Search for products on Nemlig.com.
 
     Examples:
@@ -172,58 +202,43 @@ def search(query: str, limit: int):
 
     try:
         click.echo(f"Searching for: {query}")
-        products = api.search_products(query, limit=limit)
+        products = api.search_products(query, limit=limit, use_cache=not no_cache)
 
         if not products:
             click.echo("No products found.")
             return
 
-        click.echo()
-        click.echo(f"{'ID':<8} {'Name':<28} {'Price':<8} {'Size':<10} Status")
-        click.echo("-" * 6 + "   " + "-" * 28 + "  " + "-" * 6 + "   " + "-" * 8 + "   " + "-" * 10)
+        # Collect the table and write it with a single echo
+        lines = [
+            "",
+            f"{'ID':<8} {'Name':<28} {'Price':<8} {'Size':<10} Status",
+            "-" * 6 + "   " + "-" * 28 + "  " + "-" * 6 + "   " + "-" * 8 + "   " + "-" * 10,
+        ]
 
+        append = lines.append
         for product in products:
-            pid = str(product.get("id", ""))[:8]
-            name = (product.get("name", "Unknown") or "Unknown")[:28]
-            price = product.get("price")
+            get = product.get
+            pid = str(get("id", ""))[:8]
+            name = (get("name", "Unknown") or "Unknown")[:28]
+            price = get("price")
             price_str = f"{price:.2f}" if price else "N/A"
-            unit_size = (product.get("unit_size", "") or "")[:10]
-            available = "✓ In Stock" if product.get("available", True) else "✗ Sold Out"
+            unit_size = (get("unit_size", "") or "")[:10]
+            available = "✓ In Stock" if get("available", True) else "✗ Sold Out"
 
-            click.echo(f"{pid:<8} {name:<28}  {price_str:<6}   {unit_size:<8}   {available}")
+            append(f"{pid:<8} {name:<28}  {price_str:<6}   {unit_size:<8}   {available}")
 
             # Second line with brand, category, and labels
-            brand = product.get("brand", "")
-            category = product.get("category", "")
-            labels_list = []
-
-            # Build label tags
-            if product.get("is_refrigerated"):
-                labels_list.append("Køl")
-            if product.get("is_frozen"):
-                labels_list.append("Frost")
-            if product.get("is_organic"):
-                labels_list.append("Øko")
-            if product.get("is_dairy"):
-                labels_list.append("Dairy")
-            if product.get("is_lactose_free"):
-                labels_list.append("Laktosefri")
-            if product.get("is_gluten_free"):
-                labels_list.append("Glutenfri")
-            if product.get("is_vegan"):
-                labels_list.append("Vegan")
-            if product.get("is_on_discount"):
-                labels_list.append("Tilbud")
-
-            labels_str = " ".join(f"[{lbl}]" for lbl in labels_list)
-            details = " | ".join(filter(None, [brand, category]))
+            labels_str = " ".join(f"[{label}]" for flag, label in PRODUCT_LABELS if get(flag))
+            details = " | ".join(filter(None, [get("brand", ""), get("category", "")]))
             if labels_str:
                 details = f"{details} | {labels_str}" if details else labels_str
 
             if details:
-                click.echo(f"         {details}")
+                append(f"         {details}")
+
+            append("")
 
-            click.echo()
+        click.echo("\n".join(lines))
 
     except NemligAPIError as e:
         click.echo(f"✗ Search failed: {e}", err=True)
@@ -252,25 +267,25 @@ def cart():
             click.echo("\nUse 'nemlig add <product_id>' to add items.")
             return
 
-        click.echo()
-        click.echo("SHOPPING CART")
-        click.echo("=" * 60)
-
+        lines = ["", "SHOPPING CART", "=" * 60]
         for item in items:
-            name = item.get("ProductName", "Unknown")
-            qty = item.get("Quantity", 1)
-            price = item.get("Total", item.get("Price", 0))
-            click.echo(f"  {qty}x {name} - {price:.2f} DKK")
-
-        click.echo("-" * 60)
-        click.echo(f"Products: {item_count}")
-        click.echo(f"Subtotal: {total:.2f} DKK")
-        click.echo(f"Delivery: {delivery:.2f} DKK")
-        click.echo(f"Total: {total + delivery:.2f} DKK")
+            get = item.get
+            price = get("Total", get("Price", 0))
+            lines.append(
+                f"  {get('Quantity', 1)}x {get('ProductName', 'Unknown')} - {price:.2f} DKK"
+            )
+
+        lines.append(
+            f"{'-' * 60}\n"
+            f"Products: {item_count}\n"
+            f"Subtotal: {total:.2f} DKK\n"
+            f"Delivery: {delivery:.2f} DKK\n"
+            f"Total: {total + delivery:.2f} DKK"
+        )
         if delivery_time:
-            click.echo(f"\nDelivery: {delivery_time}")
-        click.echo()
-        click.echo("View online: https://www.nemlig.com/basket")
+            lines.append(f"\nDelivery: {delivery_time}")
+        lines.append("\nView online: https://www.nemlig.com/basket")
+        click.echo("\n".join(lines))
 
     except NemligAPIError as e:
         click.echo(f"✗ Failed to get cart: {e}", err=True)
@@ -306,6 +321,30 @@ def add_to_cart(product_id: int, quantity: int):
         raise SystemExit(1) from None
 
 
+# ============================================================================
+# Cache Commands
+# ============================================================================
+
+
+@cli.group()
+def cache():
+    """Manage locally cached data."""
+
+
+@cache.command("clear")
+@click.option("--search", "search_only", is_flag=True, help="Only clear cached search results")
+@click.option("--recipes", "recipes_only", is_flag=True, help="Only clear cached recipe parses")
+def cache_clear(search_only: bool, recipes_only: bool):
+    """Remove cached search results and recipe parses."""
+    clear_all = not (search_only or recipes_only)
+    if clear_all or search_only:
+        clear_search_cache()
+        click.echo("✓ Search cache cleared")
+    if clear_all or recipes_only:
+        clear_recipe_cache()
+        click.echo("✓ Recipe cache cleared")
+
+
 # ============================================================================
 # Entry Point
 # ============================================================================
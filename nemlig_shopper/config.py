@@ -1,6 +1,8 @@
 """Configuration and credential management for Nemlig Shopper."""
 
+import json
 import os
+import time
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -13,6 +15,13 @@ APP_NAME = "nemlig-shopper"
 CONFIG_DIR = Path.home() / f".{APP_NAME}"
 CREDENTIALS_FILE = CONFIG_DIR / "credentials.json"
 
+# Cached API lookups (safe to delete at any time)
+CACHE_DIR = CONFIG_DIR / "cache"
+GROUP_ID_CACHE_FILE = CACHE_DIR / "group_ids.json"
+SESSION_FILE = CACHE_DIR / "session.json"
+RECIPE_CACHE_DIR = CACHE_DIR / "recipes"
+SEARCH_CACHE_DIR = CACHE_DIR / "search"
+
 # Ensure config directory exists
 CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -30,8 +39,6 @@ def get_credentials() -> tuple[str | None, str | None]:
 
     # Try reading from credentials file
     if CREDENTIALS_FILE.exists():
-        import json
-
         try:
             with open(CREDENTIALS_FILE) as f:
                 creds = json.load(f)
@@ -44,8 +51,6 @@ def get_credentials() -> tuple[str | None, str | None]:
 
 def save_credentials(username: str, password: str) -> None:
     """Save credentials to config file."""
-    import json
-
     with open(CREDENTIALS_FILE, "w") as f:
         json.dump({"username": username, "password": password}, f)
     # Set restrictive permissions
@@ -56,3 +61,43 @@ def clear_credentials() -> None:
     """Remove saved credentials."""
     if CREDENTIALS_FILE.exists():
         CREDENTIALS_FILE.unlink()
+
+
+def clear_session() -> None:
+    """Remove the cached API session."""
+    if SESSION_FILE.exists():
+        SESSION_FILE.unlink()
+
+
+def clear_recipe_cache() -> None:
+    """Remove cached recipe parses."""
+    if RECIPE_CACHE_DIR.exists():
+        for path in RECIPE_CACHE_DIR.glob("*.json"):
+            path.unlink()
+
+
+def prune_cache_dir(directory: Path, max_age: float, max_entries: int | None = None) -> None:
+    """Remove cache files not used for max_age seconds, then the oldest beyond max_entries.
+
+    Cache readers touch a file's mtime on a hit, so mtime tracks last use.
+    """
+    try:
+        entries = sorted(
+            ((path.stat().st_mtime, path) for path in directory.glob("*.json")), reverse=True
+        )
+    except OSError:
+        return
+    cutoff = time.time() - max_age
+    for index, (mtime, path) in enumerate(entries):
+        if mtime < cutoff or (max_entries is not None and index >= max_entries):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def clear_search_cache() -> None:
+    """Remove cached product search results."""
+    if SEARCH_CACHE_DIR.exists():
+        for path in SEARCH_CACHE_DIR.glob("*.json"):
+            path.unlink()
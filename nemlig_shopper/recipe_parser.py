@@ -1,32 +1,41 @@
 """Recipe URL and text parsing module."""
 
+import hashlib
+import json
+import os
 import re
+import time
 from dataclasses import dataclass, field
+from importlib.util import find_spec
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+from .config import RECIPE_CACHE_DIR, prune_cache_dir
+
 if TYPE_CHECKING:
-    pass
+    from bs4 import BeautifulSoup
 
 try:
-    from recipe_scrapers import scrape_me
-    from recipe_scrapers._exceptions import WebsiteNotImplementedError
+    import orjson
 
-    SCRAPERS_AVAILABLE = True
+    _json_loads = orjson.loads
 except ImportError:
-    SCRAPERS_AVAILABLE = False
-    scrape_me = None  # type: ignore[assignment]
-    WebsiteNotImplementedError = Exception  # type: ignore[misc,assignment]
+    _json_loads = json.loads
 
-try:
-    import httpx
-    from bs4 import BeautifulSoup
+# recipe-scrapers and bs4 are slow to import, so they are only checked for here
+# and imported on the URL parsing path. Text parsing and the rest of the CLI
+# start without them.
+SCRAPERS_AVAILABLE = find_spec("recipe_scrapers") is not None
+WEB_SCRAPING_AVAILABLE = find_spec("httpx") is not None and find_spec("bs4") is not None
 
-    WEB_SCRAPING_AVAILABLE = True
-except ImportError:
-    WEB_SCRAPING_AVAILABLE = False
+# Prefer lxml's C parser for the fallback scraper, falling back to the stdlib one
+HTML_PARSER = "lxml" if find_spec("lxml") is not None else "html.parser"
+
+# Parsed recipes are cached on disk for a week, keyed by a hash of the URL
+RECIPE_CACHE_TTL = 7 * 24 * 60 * 60
 
 
-@dataclass
+@dataclass(slots=True)
 class Ingredient:
     """Represents a parsed ingredient."""
 
@@ -48,7 +57,7 @@ class Ingredient:
         return " ".join(parts)
 
 
-@dataclass
+@dataclass(slots=True)
 class Recipe:
     """Represents a parsed recipe."""
 
@@ -199,6 +208,30 @@ FRACTIONS = {
     "1/8": 0.125,
 }
 
+# Patterns used when parsing ingredient lines
+_MULTIPLIER_RE = re.compile(r"^(\d+)\s*[xX]\s+")  # "3x", "3 x"
+_MULTIPLIER_PREFIX_RE = re.compile(r"^[xX]\s*(\d+)\s+")  # "x3"
+# "1", "1.5", "1,5" (Danish), "1 1/2", "1-2" (range); [\.,] accepts either decimal separator
+_QUANTITY_RE = re.compile(
+    r"^(\d+(?:[\.,]\d+)?(?:\s*[-–]\s*\d+(?:[\.,]\d+)?)?(?:\s+\d+/\d+)?|\d+/\d+)"
+)
+_RANGE_SEP_RE = re.compile(r"[-–]")
+_PAREN_NOTE_RE = re.compile(r"\(([^)]+)\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+_LIST_MARKER_RE = re.compile(r"^[\-\*•]\s*")
+_LIST_NUMBER_RE = re.compile(r"^\d+\.\s*")
+
+# Text that mentions a serving count when scraping recipe pages
+_SERVINGS_WORD_RE = re.compile(r"personer|servings|portioner", re.IGNORECASE)
+# First number in a yields/servings string, e.g. "4 personer" -> "4"
+_SERVINGS_NUMBER_RE = re.compile(r"(\d+)")
+# Inline Nuxt state assignment: window.__NUXT__ = {...};
+_NUXT_STATE_RE = re.compile(r"window\.__NUXT__\s*=\s*({.+?});?\s*$", re.DOTALL)
+# Flat JSON object embedded in a script that carries an ingredientGroups key
+_INGREDIENT_GROUPS_RE = re.compile(r'\{[^{}]*"ingredientGroups"[^{}]*\}')
+# Scraped list items that are sub-section headings rather than ingredients
+_SECTION_HEADERS = frozenset({"tilbehør", "dressing", "sauce", "marinade", "topping"})
+
 
 def parse_quantity(text: str) -> tuple[float | None, str]:
     """
@@ -212,27 +245,25 @@ def parse_quantity(text: str) -> tuple[float | None, str]:
     """
     text = text.strip()
 
-    # Check for unicode fractions first
-    for frac, value in FRACTIONS.items():
-        if text.startswith(frac):
-            remaining = text[len(frac) :].strip()
-            # Check for mixed number (e.g., "1½")
-            return value, remaining
+    # Check for fractions first. FRACTIONS keys are either a single unicode
+    # glyph ("½") or three characters ("1/2"), so look up those prefixes directly
+    for frac in (text[:1], text[:3]):
+        value = FRACTIONS.get(frac)
+        if value is not None:
+            return value, text[len(frac) :].strip()
 
     # Handle "Nx" or "xN" patterns (e.g., "3x", "x3", "3 x")
-    multiplier_match = re.match(r"^(\d+)\s*[xX]\s+", text)
+    multiplier_match = _MULTIPLIER_RE.match(text)
     if multiplier_match:
         return float(multiplier_match.group(1)), text[multiplier_match.end() :].strip()
 
     # Handle "x N" at start (less common)
-    multiplier_match2 = re.match(r"^[xX]\s*(\d+)\s+", text)
+    multiplier_match2 = _MULTIPLIER_PREFIX_RE.match(text)
     if multiplier_match2:
         return float(multiplier_match2.group(1)), text[multiplier_match2.end() :].strip()
 
     # Match patterns like "1", "1.5", "1,5" (Danish), "1 1/2", "1-2" (range)
-    # Note: [\.,] matches both period and comma as decimal separator
-    pattern = r"^(\d+(?:[\.,]\d+)?(?:\s*[-–]\s*\d+(?:[\.,]\d+)?)?(?:\s+\d+/\d+)?|\d+/\d+)"
-    match = re.match(pattern, text)
+    match = _QUANTITY_RE.match(text)
 
     if match:
         qty_str = match.group(1)
@@ -243,7 +274,7 @@ def parse_quantity(text: str) -> tuple[float | None, str]:
 
         # Handle ranges (take the higher value)
         if "-" in qty_str_normalized or "–" in qty_str_normalized:
-            parts = re.split(r"[-–]", qty_str_normalized)
+            parts = _RANGE_SEP_RE.split(qty_str_normalized)
             try:
                 return float(parts[-1].strip()), remaining
             except ValueError:
@@ -327,7 +358,7 @@ def parse_ingredient_text(text: str) -> Ingredient:
     name = remaining
 
     # Check for parenthetical notes
-    paren_match = re.search(r"\(([^)]+)\)", remaining)
+    paren_match = _PAREN_NOTE_RE.search(remaining)
     if paren_match:
         notes = paren_match.group(1)
         name = remaining[: paren_match.start()] + remaining[paren_match.end() :]
@@ -344,7 +375,7 @@ def parse_ingredient_text(text: str) -> Ingredient:
 
     # Clean up name
     name = name.strip().rstrip(",.")
-    name = re.sub(r"\s+", " ", name)  # Normalize whitespace
+    name = _WHITESPACE_RE.sub(" ", name)  # Normalize whitespace
 
     return Ingredient(original=original, name=name, quantity=quantity, unit=unit, notes=notes)
 
@@ -359,30 +390,30 @@ def parse_ingredients_text(text: str) -> list[Ingredient]:
     Returns:
         List of Ingredient objects
     """
-    ingredients = []
+    ingredients: list[Ingredient] = []
+    append = ingredients.append
 
-    for line in text.strip().split("\n"):
+    for line in text.strip().splitlines():
         line = line.strip()
         # Skip empty lines and headers
         if not line or line.lower().startswith(("ingredients", "for the", "---")):
             continue
         # Skip bullet points and numbers at start
-        line = re.sub(r"^[\-\*•]\s*", "", line)
-        line = re.sub(r"^\d+\.\s*", "", line)
+        line = _LIST_MARKER_RE.sub("", line)
+        line = _LIST_NUMBER_RE.sub("", line)
 
         if line:
-            ingredients.append(parse_ingredient_text(line))
+            append(parse_ingredient_text(line))
 
     return ingredients
 
 
 def _extract_json_ld_recipe(soup: "BeautifulSoup") -> dict[str, Any] | None:
     """Extract recipe data from JSON-LD script tags."""
-    import json
-
     for script in soup.find_all("script", type="application/ld+json"):
         try:
-            data = json.loads(script.string or "")
+            # script.string is a bs4 str subclass, which orjson rejects
+            data = _json_loads((script.string or "").encode())
 
             # Handle both single object and array formats
             if isinstance(data, list):
@@ -408,14 +439,12 @@ def _extract_nuxt3_payload(soup: "BeautifulSoup") -> list[Ingredient] | None:
     as references to other array elements. This function resolves those
     references to extract ingredient data.
     """
-    import json
-
     nuxt_script = soup.find("script", id="__NUXT_DATA__")
     if not nuxt_script or not nuxt_script.string:
         return None
 
     try:
-        data = json.loads(nuxt_script.string)
+        data = _json_loads(nuxt_script.string.encode())
     except json.JSONDecodeError:
         return None
 
@@ -448,8 +477,9 @@ def _extract_nuxt3_payload(soup: "BeautifulSoup") -> list[Ingredient] | None:
                 amount = resolve(item.get("amountOfContent"))
                 unit = resolve(item.get("unitOfContent"))
 
-                if isinstance(name, str) and name and name.lower() not in seen_names:
-                    seen_names.add(name.lower())
+                name_lower = name.lower() if isinstance(name, str) else ""
+                if name_lower and name_lower not in seen_names:
+                    seen_names.add(name_lower)
 
                     # Build original string
                     parts = []
@@ -476,17 +506,15 @@ def _extract_nuxt3_payload(soup: "BeautifulSoup") -> list[Ingredient] | None:
 
 def _extract_nuxt_data(soup: "BeautifulSoup") -> dict[str, Any] | None:
     """Extract recipe data from Nuxt.js __NUXT_DATA__ or similar."""
-    import json
-
     # Look for Nuxt data script
     for script in soup.find_all("script"):
         script_text = script.string or ""
         if "__NUXT__" in script_text or "window.__NUXT__" in script_text:
             # Try to extract JSON from the script
-            match = re.search(r"window\.__NUXT__\s*=\s*({.+?});?\s*$", script_text, re.DOTALL)
+            match = _NUXT_STATE_RE.search(script_text)
             if match:
                 try:
-                    return json.loads(match.group(1))
+                    return _json_loads(match.group(1))
                 except json.JSONDecodeError:
                     pass
 
@@ -497,8 +525,8 @@ def _extract_nuxt_data(soup: "BeautifulSoup") -> dict[str, Any] | None:
             # Try to find JSON object containing recipe
             try:
                 # Find JSON-like structures
-                for match in re.finditer(r'\{[^{}]*"ingredientGroups"[^{}]*\}', script_text):
-                    data = json.loads(match.group(0))
+                for match in _INGREDIENT_GROUPS_RE.finditer(script_text):
+                    data = _json_loads(match.group(0))
                     if "ingredientGroups" in data:
                         return data
             except (json.JSONDecodeError, TypeError):
@@ -520,11 +548,14 @@ def _scrape_recipe_fallback(url: str) -> Recipe:
             "Install with: pip install httpx beautifulsoup4"
         )
 
+    import httpx
+    from bs4 import BeautifulSoup
+
     # Fetch the page
     response = httpx.get(url, follow_redirects=True, timeout=30.0)
     response.raise_for_status()
 
-    soup = BeautifulSoup(response.text, "html.parser")
+    soup = BeautifulSoup(response.text, HTML_PARSER)
 
     # Try to extract from JSON-LD first (most reliable)
     json_ld = _extract_json_ld_recipe(soup)
@@ -537,7 +568,7 @@ def _scrape_recipe_fallback(url: str) -> Recipe:
         if recipe_yield:
             if isinstance(recipe_yield, list):
                 recipe_yield = recipe_yield[0]
-            match = re.search(r"(\d+)", str(recipe_yield))
+            match = _SERVINGS_NUMBER_RE.search(str(recipe_yield))
             if match:
                 servings = int(match.group(1))
 
@@ -566,8 +597,8 @@ def _scrape_recipe_fallback(url: str) -> Recipe:
         # Try to find servings
         servings = None
         for text in soup.stripped_strings:
-            if any(word in text.lower() for word in ["personer", "servings", "portioner"]):
-                match = re.search(r"(\d+)", text)
+            if _SERVINGS_WORD_RE.search(text):
+                match = _SERVINGS_NUMBER_RE.search(text)
                 if match:
                     servings = int(match.group(1))
                     break
@@ -595,7 +626,7 @@ def _scrape_recipe_fallback(url: str) -> Recipe:
         elem = soup.select_one(selector)
         if elem:
             text = elem.get_text(strip=True)
-            match = re.search(r"(\d+)", text)
+            match = _SERVINGS_NUMBER_RE.search(text)
             if match:
                 servings = int(match.group(1))
                 break
@@ -603,8 +634,8 @@ def _scrape_recipe_fallback(url: str) -> Recipe:
     # Also try to find servings in text patterns
     if not servings:
         for text in soup.stripped_strings:
-            if any(word in text.lower() for word in ["personer", "servings", "portioner"]):
-                match = re.search(r"(\d+)", text)
+            if _SERVINGS_WORD_RE.search(text):
+                match = _SERVINGS_NUMBER_RE.search(text)
                 if match:
                     servings = int(match.group(1))
                     break
@@ -613,10 +644,11 @@ def _scrape_recipe_fallback(url: str) -> Recipe:
     raw_ingredients: list[str] = []
 
     # Method 1: Schema.org markup (microdata)
-    for elem in soup.select("[itemprop='recipeIngredient'], [itemprop='ingredients']"):
-        text = elem.get_text(strip=True)
-        if text:
-            raw_ingredients.append(text)
+    texts = (
+        elem.get_text(strip=True)
+        for elem in soup.select("[itemprop='recipeIngredient'], [itemprop='ingredients']")
+    )
+    raw_ingredients.extend(text for text in texts if text)
 
     # Method 2: Common ingredient list classes
     if not raw_ingredients:
@@ -629,10 +661,8 @@ def _scrape_recipe_fallback(url: str) -> Recipe:
         ]:
             elems = soup.select(selector)
             if elems:
-                for elem in elems:
-                    text = elem.get_text(strip=True)
-                    if text and len(text) > 2:
-                        raw_ingredients.append(text)
+                texts = (elem.get_text(strip=True) for elem in elems)
+                raw_ingredients.extend(text for text in texts if len(text) > 2)
                 break
 
     # Method 3: Look for lists after "Ingredienser" heading
@@ -643,22 +673,20 @@ def _scrape_recipe_fallback(url: str) -> Recipe:
                 # Find the next list
                 next_elem = heading.find_next(["ul", "ol"])
                 if next_elem:
-                    for li in next_elem.find_all("li"):
-                        text = li.get_text(strip=True)
-                        if text:
-                            raw_ingredients.append(text)
+                    texts = (li.get_text(strip=True) for li in next_elem.find_all("li"))
+                    raw_ingredients.extend(text for text in texts if text)
                 break
 
     # Filter out section headers and recipe names
     filtered_ingredients = []
-    skip_patterns = ["tilbehør", "dressing", "sauce", "marinade", "topping"]
+    title_lower = title.lower()
     for ing in raw_ingredients:
         ing_lower = ing.lower().strip()
         # Skip if it looks like a section header (single word, no numbers)
-        if not any(c.isdigit() for c in ing) and ing_lower in skip_patterns:
+        if not any(c.isdigit() for c in ing) and ing_lower in _SECTION_HEADERS:
             continue
         # Skip if it's the recipe title
-        if title and ing_lower == title.lower():
+        if ing_lower == title_lower:
             continue
         filtered_ingredients.append(ing)
 
@@ -668,14 +696,50 @@ def _scrape_recipe_fallback(url: str) -> Recipe:
     return Recipe(title=title, ingredients=ingredients, servings=servings, source_url=url)
 
 
-def parse_recipe_url(url: str) -> Recipe:
+def _recipe_cache_path(url: str) -> Path:
+    """Get the cache file for a recipe URL."""
+    return RECIPE_CACHE_DIR / f"{hashlib.sha1(url.encode()).hexdigest()}.json"
+
+
+def _load_cached_recipe(url: str) -> Recipe | None:
+    """Load a cached recipe for a URL if one exists and has not expired."""
+    path = _recipe_cache_path(url)
+    try:
+        data = _json_loads(path.read_bytes())
+        if time.time() - data["cached_at"] > RECIPE_CACHE_TTL:
+            path.unlink()
+            return None
+        recipe = Recipe.from_dict(data["recipe"])
+        # Mark the entry as recently used for prune_cache_dir()
+        os.utime(path)
+        return recipe
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _store_cached_recipe(url: str, recipe: Recipe) -> None:
+    """Write a parsed recipe to the cache, ignoring filesystem errors."""
+    try:
+        RECIPE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _recipe_cache_path(url).write_text(
+            json.dumps({"cached_at": time.time(), "recipe": recipe.to_dict()})
+        )
+    except OSError:
+        return
+    prune_cache_dir(RECIPE_CACHE_DIR, RECIPE_CACHE_TTL)
+
+
+def parse_recipe_url(url: str, use_cache: bool = True) -> Recipe:
     """
     Parse a recipe from a URL using recipe-scrapers.
 
-    Falls back to custom scraping for unsupported websites.
+    Falls back to custom scraping for unsupported websites. Results are
+    cached on disk for RECIPE_CACHE_TTL seconds.
 
     Args:
         url: URL to a recipe page
+        use_cache: Return a cached parse if available (a fresh parse is
+            cached either way)
 
     Returns:
         Recipe object with parsed data
@@ -684,12 +748,29 @@ def parse_recipe_url(url: str) -> Recipe:
         ImportError: If recipe-scrapers is not installed
         Exception: If scraping fails
     """
-    if not SCRAPERS_AVAILABLE or scrape_me is None:
+    if use_cache:
+        cached = _load_cached_recipe(url)
+        if cached is not None:
+            return cached
+
+    recipe = _scrape_recipe(url)
+    # Don't keep empty parses (e.g. a cookie wall) around for the whole TTL
+    if recipe.ingredients:
+        _store_cached_recipe(url, recipe)
+    return recipe
+
+
+def _scrape_recipe(url: str) -> Recipe:
+    """Scrape and parse a recipe page without consulting the cache."""
+    if not SCRAPERS_AVAILABLE:
         raise ImportError(
             "recipe-scrapers package is required for URL parsing. "
             "Install with: pip install recipe-scrapers"
         )
 
+    from recipe_scrapers import scrape_me
+    from recipe_scrapers._exceptions import WebsiteNotImplementedError
+
     try:
         scraper = scrape_me(url)
 
@@ -703,7 +784,7 @@ def parse_recipe_url(url: str) -> Recipe:
             servings_str = scraper.yields()
             if servings_str:
                 # Extract number from string like "4 servings"
-                match = re.search(r"(\d+)", servings_str)
+                match = _SERVINGS_NUMBER_RE.search(servings_str)
                 if match:
                     servings = int(match.group(1))
         except Exception:
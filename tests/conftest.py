@@ -10,6 +10,25 @@ from nemlig_shopper.config import API_BASE_URL
 SEARCH_GATEWAY_URL = "https://webapi.prod.knl.nemlig.it/searchgateway/api"
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Keep API caches out of the real config directory."""
+    monkeypatch.setattr("nemlig_shopper.api.GROUP_ID_CACHE_FILE", tmp_path / "group_ids.json")
+    monkeypatch.setattr("nemlig_shopper.api.SESSION_FILE", tmp_path / "session.json")
+    monkeypatch.setattr("nemlig_shopper.config.SESSION_FILE", tmp_path / "session.json")
+    monkeypatch.setattr("nemlig_shopper.recipe_parser.RECIPE_CACHE_DIR", tmp_path / "recipes")
+    monkeypatch.setattr("nemlig_shopper.config.RECIPE_CACHE_DIR", tmp_path / "recipes")
+    monkeypatch.setattr("nemlig_shopper.api.SEARCH_CACHE_DIR", tmp_path / "search")
+    monkeypatch.setattr("nemlig_shopper.config.SEARCH_CACHE_DIR", tmp_path / "search")
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def no_retry_backoff(monkeypatch):
+    """Retry transient HTTP errors without sleeping."""
+    monkeypatch.setattr("nemlig_shopper.api.HTTP_RETRY_BACKOFF", 0.0)
+
+
 @pytest.fixture
 def mock_httpx():
     """Activate respx mock for HTTP requests."""
@@ -1,9 +1,14 @@
 """Tests for the NemligAPI client."""
 
+import base64
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import httpx
 import pytest
 
-from nemlig_shopper.api import NemligAPIError
+from nemlig_shopper.api import HTTP_STATUS_RETRIES, NemligAPI, NemligAPIError
 from nemlig_shopper.config import API_BASE_URL
 
 # Search gateway URL used by the API
@@ -21,6 +26,10 @@ class TestApiInitialization:
         assert headers["platform"] == "web"
         assert headers["device-size"] == "desktop"
 
+    def test_gateway_client_omits_content_type(self, api_client):
+        """Gateway client should not send Content-Type (the gateway rejects it)."""
+        assert "Content-Type" not in api_client._gateway_client.headers
+
     def test_starts_logged_out(self, api_client):
         """Client should start in logged-out state."""
         assert not api_client.is_logged_in()
@@ -28,6 +37,94 @@ class TestApiInitialization:
         assert api_client._user_id is None
 
 
+class TestRetries:
+    """Tests for retrying transient HTTP errors."""
+
+    def test_get_is_retried_on_server_error(self, mock_httpx, api_client):
+        """GET requests should be retried after a transient 503."""
+        route = mock_httpx.get(f"{API_BASE_URL}/Token").mock(
+            side_effect=[
+                httpx.Response(503),
+                httpx.Response(200, json={"access_token": "retried-token"}),
+            ]
+        )
+
+        assert api_client._get_token() == "retried-token"
+        assert route.call_count == 2
+
+    def test_post_is_not_retried_on_server_error(self, mock_httpx, api_client):
+        """Non-idempotent POSTs should not be replayed after a 500."""
+        api_client._logged_in = True
+        route = mock_httpx.post(f"{API_BASE_URL}/basket/AddToBasket").respond(status_code=500)
+
+        with pytest.raises(NemligAPIError):
+            api_client.add_to_cart(100001)
+
+        assert route.call_count == 1
+
+    def test_post_is_retried_when_rate_limited(self, mock_httpx, api_client):
+        """A 429 means the request was not processed, so POSTs may be retried."""
+        api_client._logged_in = True
+        route = mock_httpx.post(f"{API_BASE_URL}/basket/AddToBasket").mock(
+            side_effect=[
+                httpx.Response(429, headers={"Retry-After": "0"}),
+                httpx.Response(200, json={}),
+            ]
+        )
+
+        assert api_client.add_to_cart(100001) is True
+        assert route.call_count == 2
+
+
+class TestCorrelationIds:
+    """Tests for X-Correlation-Id generation."""
+
+    def test_correlation_ids_are_unique(self, api_client):
+        """Correlation IDs should be unique within a client."""
+        ids = [api_client._next_correlation_id() for _ in range(200)]
+
+        assert len(set(ids)) == 200
+
+    def test_correlation_id_uses_uuid_layout(self, api_client):
+        """Correlation IDs should be formatted like a UUID."""
+        parts = api_client._get_correlation_headers()["X-Correlation-Id"].split("-")
+
+        assert [len(part) for part in parts] == [8, 4, 4, 4, 12]
+
+
+class TestSessionGuard:
+    """Tests for the shared session-refresh guard."""
+
+    def test_concurrent_callers_refresh_once(self, mock_httpx, api_client, setup_session_mocks):
+        """Threads racing on a cold client should share a single refresh."""
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: api_client._ensure_session(), range(8)))
+
+        token_route = setup_session_mocks.routes[0]  # /Token is registered first
+        assert token_route.call_count == 1
+        assert api_client._session_ready.is_set()
+
+    def test_failed_refresh_runs_once_per_search(
+        self,
+        mock_httpx,
+        api_client,
+        mock_app_settings_response,
+        mock_user_response,
+        mock_timeslot_response,
+    ):
+        """A search with an unavailable /Token should refresh once, not once per helper."""
+        token_route = mock_httpx.get(f"{API_BASE_URL}/Token").respond(status_code=500)
+        mock_httpx.get(f"{API_BASE_URL}/v2/AppSettings/Website").respond(
+            json=mock_app_settings_response
+        )
+        mock_httpx.get(f"{API_BASE_URL}/user/GetCurrentUser").respond(json=mock_user_response)
+        mock_httpx.get(f"{API_BASE_URL}/Order/DeliverySpot").respond(json=mock_timeslot_response)
+
+        assert api_client.search_products("mælk") == []
+        # One refresh, including the transport's status retries
+        assert token_route.call_count == HTTP_STATUS_RETRIES + 1
+
+
 class TestAuthentication:
     """Tests for login/logout functionality."""
 
@@ -118,6 +215,98 @@ class TestSessionRefresh:
         assert api_client._user_id == "67890"
         assert api_client._timeslot == "2026011509-60-600"
 
+    def test_refresh_session_updates_products_url(self, api_client, setup_session_mocks):
+        """Products URLs should reflect the refreshed timestamp, timeslot and user ID."""
+        api_client._refresh_session_data()
+
+        url = api_client._build_products_url("Products/GetByProductGroupId")
+
+        assert url == (
+            f"{API_BASE_URL}/TEST-TIMESTAMP-123/2026011509-60-600/1/67890/"
+            "Products/GetByProductGroupId"
+        )
+
+    def test_refresh_session_is_restored_by_new_client(self, api_client, setup_session_mocks):
+        """A persisted session should let a new client skip the bootstrap requests."""
+        api_client._refresh_session_data()
+
+        restored = NemligAPI()
+
+        assert restored._access_token == "test-jwt-token-12345"
+        assert restored._combined_timestamp == "TEST-TIMESTAMP-123"
+        assert restored._user_id == "67890"
+        assert restored.client.headers["Authorization"] == "Bearer test-jwt-token-12345"
+        assert restored._build_products_url("Products/X") == api_client._build_products_url(
+            "Products/X"
+        )
+
+    def test_session_is_not_persisted_when_disabled(
+        self, api_client, setup_session_mocks, isolated_cache
+    ):
+        """Refreshes should not write the token to disk when persistence is off."""
+        api_client.persist_session = False
+        api_client._refresh_session_data()
+
+        assert api_client._access_token == "test-jwt-token-12345"
+        assert not (isolated_cache / "session.json").exists()
+
+    def test_expired_session_is_not_restored(self, api_client, setup_session_mocks, monkeypatch):
+        """A persisted session past its expiry should be ignored."""
+        monkeypatch.setattr("nemlig_shopper.api.SESSION_TTL", -1.0)
+        api_client._refresh_session_data()
+
+        assert NemligAPI()._access_token is None
+
+    def test_malformed_session_file_is_ignored(self, isolated_cache):
+        """Session data with unexpected types should be ignored rather than crash."""
+        (isolated_cache / "session.json").write_text(
+            json.dumps({"access_token": "token", "combined_timestamp": "ts", "expires_at": None})
+        )
+
+        client = NemligAPI()
+
+        assert client._access_token is None
+        assert not client._session_ready.is_set()
+
+    def test_rejected_restored_session_is_refreshed(
+        self, mock_httpx, isolated_cache, mock_search_response, setup_session_mocks
+    ):
+        """A restored token the gateway rejects should be replaced and the request retried."""
+        session_file = isolated_cache / "session.json"
+        session_file.write_text(
+            json.dumps(
+                {
+                    "access_token": "stale-token",
+                    "combined_timestamp": "OLD-TIMESTAMP",
+                    "expires_at": time.time() + 600,
+                }
+            )
+        )
+        client = NemligAPI()
+        search = mock_httpx.get(f"{SEARCH_GATEWAY_URL}/search").mock(
+            side_effect=[
+                httpx.Response(401),
+                httpx.Response(200, json=mock_search_response),
+            ]
+        )
+
+        products = client.search_products("mælk")
+
+        assert products
+        assert search.call_count == 2
+        assert search.calls[1].request.headers["Authorization"] == "Bearer test-jwt-token-12345"
+        assert mock_httpx.routes[0].call_count == 1
+        assert json.loads(session_file.read_text())["access_token"] == "test-jwt-token-12345"
+
+    def test_session_expiry_uses_jwt_exp_claim(self):
+        """Persisted sessions should not outlive the JWT they carry."""
+        exp = int(time.time()) + 120
+        claims = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).rstrip(b"=")
+        token = f"header.{claims.decode()}.signature"
+
+        assert NemligAPI._session_expiry(token) == exp - 60
+        assert NemligAPI._session_expiry("not-a-jwt") > time.time() + 1700
+
     def test_refresh_session_handles_token_failure(
         self,
         mock_httpx,
@@ -184,6 +373,40 @@ class TestProductSearch:
         assert products[0]["price"] == 15.95
         assert products[0]["brand"] == "Arla"
 
+    def test_search_products_sends_session_params(
+        self, mock_httpx, api_client, mock_search_response, setup_session_mocks
+    ):
+        """Gateway searches should include the session's timestamp, timeslot and user."""
+        route = mock_httpx.get(f"{SEARCH_GATEWAY_URL}/search").respond(
+            json=mock_search_response, status_code=200
+        )
+
+        api_client.search_products("mælk", limit=5)
+
+        params = route.calls.last.request.url.params
+        assert params["query"] == "mælk"
+        assert params["take"] == "5"
+        assert params["timestamp"] == "TEST-TIMESTAMP-123"
+        assert params["timeslotUtc"] == "2026011509-60-600"
+        assert params["includeFavorites"] == "67890"
+        assert params["TimeSlotId"] == "2161500"
+
+    def test_search_products_sends_gateway_headers(
+        self, mock_httpx, api_client, mock_search_response, setup_session_mocks
+    ):
+        """Gateway searches should carry auth and browser headers but no Content-Type."""
+        route = mock_httpx.get(f"{SEARCH_GATEWAY_URL}/search").respond(
+            json=mock_search_response, status_code=200
+        )
+
+        api_client.search_products("mælk")
+
+        headers = route.calls.last.request.headers
+        assert headers["Authorization"] == "Bearer test-jwt-token-12345"
+        assert headers["Origin"] == "https://www.nemlig.com"
+        assert "X-Correlation-Id" in headers
+        assert "Content-Type" not in headers
+
     def test_search_products_parses_availability(self, mock_httpx, api_client, setup_session_mocks):
         """Search should correctly parse product availability."""
         mock_httpx.get(f"{SEARCH_GATEWAY_URL}/search").respond(
@@ -235,6 +458,65 @@ class TestProductSearch:
 
         assert products == []
 
+    def test_search_products_falls_back_to_categories(
+        self, mock_httpx, api_client, mock_product, setup_session_mocks
+    ):
+        """Empty gateway results should fall back to the first category with products."""
+        mock_httpx.get(f"{SEARCH_GATEWAY_URL}/search").respond(
+            json={"Products": {"Products": []}}, status_code=200
+        )
+        mock_httpx.get(f"{SEARCH_GATEWAY_URL}/quick").respond(
+            json={"Categories": [{"Url": "/empty"}, {"Url": "/mejeri"}]}, status_code=200
+        )
+        mock_httpx.get("https://www.nemlig.com/empty").respond(json={"content": []})
+        mock_httpx.get("https://www.nemlig.com/mejeri").respond(
+            json={"content": [{"ProductGroupId": "group-1"}]}
+        )
+        mock_httpx.get(url__regex=r".*/Products/GetByProductGroupId.*").respond(
+            json={"Products": [mock_product]}
+        )
+
+        products = api_client.search_products("mælk")
+
+        assert [p["id"] for p in products] == [100001]
+
+    def test_category_group_id_is_cached(self, mock_httpx, api_client, mock_product):
+        """A category page should only be fetched once per catalog publish stamp."""
+        api_client._combined_timestamp = "ts"
+        api_client._correlation_id = "stamp-1"
+        api_client._session_ready.set()
+        page = mock_httpx.get("https://www.nemlig.com/mejeri").respond(
+            json={"content": [{"ProductGroupId": "group-1"}]}
+        )
+        mock_httpx.get(url__regex=r".*/Products/GetByProductGroupId.*").respond(
+            json={"Products": [mock_product]}
+        )
+
+        api_client.get_products_by_category("/mejeri")
+        api_client.get_products_by_category("/mejeri")
+        assert page.call_count == 1
+
+        # The mapping survives a new client instance
+        fresh = NemligAPI()
+        fresh._combined_timestamp = "ts"
+        fresh._correlation_id = "stamp-1"
+        fresh._session_ready.set()
+        assert [p["id"] for p in fresh.get_products_by_category("/mejeri")] == [100001]
+        assert page.call_count == 1
+
+        # A new publish stamp invalidates the mapping
+        fresh._correlation_id = "stamp-2"
+        fresh.get_products_by_category("/mejeri")
+        assert page.call_count == 2
+
+    def test_malformed_group_id_entries_are_ignored(self, api_client, isolated_cache):
+        """Group-id cache entries that are not [stamp, id] pairs should be dropped."""
+        (isolated_cache / "group_ids.json").write_text(
+            json.dumps({"/ok": ["stamp", "group-1"], "/bad": "group-2", "/short": ["stamp"]})
+        )
+
+        assert api_client._load_group_ids() == {"/ok": ["stamp", "group-1"]}
+
     def test_search_products_respects_limit(self, mock_httpx, api_client, setup_session_mocks):
         """Search should respect the limit parameter."""
         many_products = [
@@ -264,6 +546,110 @@ class TestProductSearch:
         # Session should have been refreshed
         assert api_client._combined_timestamp is not None
 
+    def test_search_products_caches_results(
+        self, mock_httpx, api_client, mock_search_response, setup_session_mocks
+    ):
+        """Repeated searches for the same query should be served from cache."""
+        route = mock_httpx.get(f"{SEARCH_GATEWAY_URL}/search").respond(
+            json=mock_search_response, status_code=200
+        )
+
+        first = api_client.search_products("mælk", limit=10)
+        second = api_client.search_products(" Mælk ", limit=10)
+
+        assert route.call_count == 1
+        assert second == first
+
+    def test_search_products_does_not_cache_empty_results(
+        self, mock_httpx, api_client, setup_session_mocks
+    ):
+        """Empty results should not be cached, so a later search retries."""
+        route = mock_httpx.get(f"{SEARCH_GATEWAY_URL}/search").respond(
+            json={"Products": {"Products": []}}, status_code=200
+        )
+        mock_httpx.get(f"{SEARCH_GATEWAY_URL}/quick").respond(
+            json={"Categories": []}, status_code=200
+        )
+
+        api_client.search_products("mælk")
+        api_client.search_products("mælk")
+
+        assert route.call_count == 2
+
+    def test_search_results_persist_across_clients(
+        self, mock_httpx, api_client, mock_search_response, setup_session_mocks
+    ):
+        """A fresh client should reuse search results cached on disk."""
+        route = mock_httpx.get(f"{SEARCH_GATEWAY_URL}/search").respond(
+            json=mock_search_response, status_code=200
+        )
+
+        first = api_client.search_products("mælk")
+        second = NemligAPI().search_products("mælk")
+
+        assert route.call_count == 1
+        assert second == first
+
+    def test_expired_disk_search_results_are_removed(
+        self, mock_httpx, api_client, mock_search_response, setup_session_mocks, isolated_cache
+    ):
+        """Expired search cache files should be deleted when read."""
+        mock_httpx.get(f"{SEARCH_GATEWAY_URL}/search").respond(
+            json=mock_search_response, status_code=200
+        )
+        api_client.search_products("mælk")
+        [path] = (isolated_cache / "search").glob("*.json")
+        data = json.loads(path.read_text())
+        data["cached_at"] -= 7 * 60 * 60
+        path.write_text(json.dumps(data))
+        mock_httpx.get(f"{SEARCH_GATEWAY_URL}/search").respond(status_code=500)
+        mock_httpx.get(f"{SEARCH_GATEWAY_URL}/quick").respond(json={"Categories": []})
+
+        assert NemligAPI().search_products("mælk") == []
+        assert not path.exists()
+
+    def test_disk_search_cache_is_keyed_on_session(
+        self, mock_httpx, api_client, mock_search_response, setup_session_mocks
+    ):
+        """Cached results from another timeslot should not be reused."""
+        route = mock_httpx.get(f"{SEARCH_GATEWAY_URL}/search").respond(
+            json=mock_search_response, status_code=200
+        )
+        api_client.search_products("mælk")
+
+        other = NemligAPI()
+        other._timeslot = "2026011610-60-600"
+        other.search_products("mælk")
+
+        assert route.call_count == 2
+
+    def test_search_products_can_bypass_cache(
+        self, mock_httpx, api_client, mock_search_response, setup_session_mocks
+    ):
+        """use_cache=False should query the gateway even when results are cached."""
+        route = mock_httpx.get(f"{SEARCH_GATEWAY_URL}/search").respond(
+            json=mock_search_response, status_code=200
+        )
+
+        api_client.search_products("mælk")
+        api_client.search_products("mælk", use_cache=False)
+
+        assert route.call_count == 2
+
+    def test_expired_disk_search_results_are_refetched(
+        self, mock_httpx, api_client, mock_search_response, setup_session_mocks, monkeypatch
+    ):
+        """Disk cache entries older than the TTL should be ignored."""
+        monkeypatch.setattr("nemlig_shopper.api.SEARCH_DISK_CACHE_TTL", -1)
+        route = mock_httpx.get(f"{SEARCH_GATEWAY_URL}/search").respond(
+            json=mock_search_response, status_code=200
+        )
+
+        api_client.search_products("mælk")
+        NemligAPI().search_products("mælk")
+
+        assert route.call_count == 2
+
 
 class TestSearchSuggestions:
     """Tests for search suggestions functionality."""
@@ -321,13 +707,16 @@ class TestCartOperations:
         api_client.login("test@example.com", "password")
 
         # Add to cart
-        mock_httpx.post(f"{API_BASE_URL}/basket/AddToBasket").respond(
+        route = mock_httpx.post(f"{API_BASE_URL}/basket/AddToBasket").respond(
             json={"Success": True}, status_code=200
         )
 
         result = api_client.add_to_cart(100001, quantity=2)
 
         assert result is True
+        request = route.calls.last.request
+        assert request.headers["Content-Type"] == "application/json"
+        assert json.loads(request.content) == {"ProductId": 100001, "Quantity": 2}
 
     def test_add_to_cart_network_error(
         self, mock_httpx, api_client, mock_login_success_response, setup_session_mocks
@@ -356,13 +745,13 @@ class TestCartOperations:
         )
         api_client.login("test@example.com", "password")
 
-        # Use side_effect with a list to sequence multiple responses
-        mock_httpx.post(f"{API_BASE_URL}/basket/AddToBasket").mock(
-            side_effect=[
-                httpx.Response(200, json={"Success": True}),
-                httpx.ConnectError("timeout"),
-            ]
-        )
+        # Items are added concurrently, so respond based on the product in the payload
+        def add_to_basket(request):
+            if json.loads(request.content)["ProductId"] == 100002:
+                raise httpx.ConnectError("timeout")
+            return httpx.Response(200, json={"Success": True})
+
+        mock_httpx.post(f"{API_BASE_URL}/basket/AddToBasket").mock(side_effect=add_to_basket)
 
         items = [
             {"product_id": 100001, "quantity": 1},
@@ -476,6 +865,26 @@ class TestProductParsing:
         assert product["category"] == ""
         assert product["labels"] == []
 
+    def test_parse_products_detects_label_flags(self, api_client):
+        """Product parsing should derive flags from labels and categories."""
+        product = {
+            "Id": 1,
+            "Name": "Vegansk Havredrik",
+            "Category": "Køl",
+            "SubCategory": "Plantemælk",
+            "Labels": ["Økologisk", None, "Laktosefri", "Vegansk"],
+        }
+
+        result = api_client._parse_products([product], limit=10)[0]
+
+        assert result["is_organic"] is True
+        assert result["is_lactose_free"] is True
+        assert result["is_vegan"] is True
+        assert result["is_gluten_free"] is False
+        assert result["is_refrigerated"] is True
+        assert result["is_frozen"] is False
+        assert result["is_dairy"] is True
+
     def test_parse_products_handles_unavailable(self, api_client):
         """Product parsing should correctly identify unavailable products."""
         unavailable = {
@@ -515,6 +924,17 @@ class TestErrorHandling:
 
         assert result == []
 
+    def test_redirect_on_search(self, mock_httpx, api_client, setup_session_mocks):
+        """A redirect to an HTML page during search should return empty list."""
+        mock_httpx.get(f"{SEARCH_GATEWAY_URL}/search").respond(
+            status_code=302, content=b"<html>moved</html>", headers={"Location": "/login"}
+        )
+        mock_httpx.get(f"{SEARCH_GATEWAY_URL}/quick").respond(
+            status_code=302, content=b"<html>moved</html>", headers={"Location": "/login"}
+        )
+
+        assert api_client.search_products("test") == []
+
     def test_malformed_json_on_token(self, mock_httpx, api_client):
         """Malformed JSON response should be handled gracefully."""
         mock_httpx.get(f"{API_BASE_URL}/Token").respond(content=b"not json", status_code=200)
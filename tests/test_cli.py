@@ -152,7 +152,10 @@ class TestLoginCommand:
         mock_api.login.return_value = True
 
         with patch("nemlig_shopper.cli.get_api", return_value=mock_api):
-            with patch("nemlig_shopper.cli.save_credentials") as mock_save:
+            with (
+                patch("nemlig_shopper.cli.save_credentials") as mock_save,
+                patch("nemlig_shopper.cli.clear_session") as mock_clear_session,
+            ):
                 result = runner.invoke(
                     cli,
                     ["login", "-u", "test@example.com", "-p", "password123", "--no-save"],
@@ -162,6 +165,8 @@ class TestLoginCommand:
         assert "Login successful" in result.output
         assert "Credentials saved" not in result.output
         mock_save.assert_not_called()
+        assert mock_api.persist_session is False
+        mock_clear_session.assert_called_once()
 
     def test_login_failure(self, runner, mock_api):
         """Failed login should display error and exit with code 1."""
@@ -183,7 +188,15 @@ class TestLogoutCommand:
             result = runner.invoke(cli, ["logout"])
 
         assert result.exit_code == 0
-        assert "Credentials cleared" in result.output
+        assert "Credentials, session and search cache cleared" in result.output
+        mock_clear.assert_called_once()
+
+    def test_logout_clears_search_cache(self, runner):
+        """Logout should drop cached search results."""
+        with patch("nemlig_shopper.cli.clear_search_cache") as mock_clear:
+            result = runner.invoke(cli, ["logout"])
+
+        assert result.exit_code == 0
         mock_clear.assert_called_once()
 
 
@@ -223,7 +236,17 @@ class TestSearchCommand:
         with patch("nemlig_shopper.cli.get_api", return_value=mock_api):
             runner.invoke(cli, ["search", "æg", "--limit", "1"])
 
-        mock_api.search_products.assert_called_once_with("æg", limit=1)
+        mock_api.search_products.assert_called_once_with("æg", limit=1, use_cache=True)
+
+    def test_search_no_cache_flag(self, runner, mock_api, sample_products):
+        """--no-cache should bypass cached search results."""
+        mock_api.search_products.return_value = sample_products
+
+        with patch("nemlig_shopper.cli.get_api", return_value=mock_api):
+            result = runner.invoke(cli, ["search", "æg", "--no-cache"])
+
+        assert result.exit_code == 0
+        mock_api.search_products.assert_called_once_with("æg", limit=10, use_cache=False)
 
     def test_search_api_error(self, runner, mock_api):
         """Search API error should display error and exit."""
@@ -295,6 +318,14 @@ class TestParseCommand:
         assert result.exit_code == 1
         assert "Provide a URL or use --text" in result.output
 
+    def test_parse_no_cache_flag(self, runner, sample_recipe):
+        """--no-cache should bypass the recipe cache."""
+        with patch("nemlig_shopper.cli.parse_recipe_url", return_value=sample_recipe) as mock_parse:
+            result = runner.invoke(cli, ["parse", "https://example.com/recipe", "--no-cache"])
+
+        assert result.exit_code == 0
+        mock_parse.assert_called_once_with("https://example.com/recipe", use_cache=False)
+
     def test_parse_invalid_url(self, runner):
         """Parse with invalid URL should display error."""
         with patch(
@@ -307,6 +338,41 @@ class TestParseCommand:
         assert "Failed to parse" in result.output
 
 
+# ============================================================================
+# Cache Command Tests
+# ============================================================================
+
+
+class TestCacheCommand:
+    """Tests for the cache command group."""
+
+    def test_cache_clear(self, runner):
+        """cache clear should remove cached searches and recipes."""
+        with (
+            patch("nemlig_shopper.cli.clear_search_cache") as mock_search,
+            patch("nemlig_shopper.cli.clear_recipe_cache") as mock_recipes,
+        ):
+            result = runner.invoke(cli, ["cache", "clear"])
+
+        assert result.exit_code == 0
+        assert "Search cache cleared" in result.output
+        assert "Recipe cache cleared" in result.output
+        mock_search.assert_called_once()
+        mock_recipes.assert_called_once()
+
+    def test_cache_clear_search_only(self, runner):
+        """cache clear --search should leave cached recipes alone."""
+        with (
+            patch("nemlig_shopper.cli.clear_search_cache") as mock_search,
+            patch("nemlig_shopper.cli.clear_recipe_cache") as mock_recipes,
+        ):
+            result = runner.invoke(cli, ["cache", "clear", "--search"])
+
+        assert result.exit_code == 0
+        mock_search.assert_called_once()
+        mock_recipes.assert_not_called()
+
+
 # ============================================================================
 # Add to Cart Command Tests
 # ============================================================================
@@ -1,7 +1,9 @@
 """Tests for the config module."""
 
 import json
+import os
 import stat
+import time
 
 import pytest
 
@@ -241,6 +243,54 @@ class TestClearCredentials:
         assert password is None
 
 
+# ============================================================================
+# Prune Cache Tests
+# ============================================================================
+
+
+class TestPruneCacheDir:
+    """Tests for prune_cache_dir function."""
+
+    def _write(self, directory, name, age):
+        path = directory / f"{name}.json"
+        path.write_text("{}")
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_removes_stale_files(self, tmp_path):
+        """Files unused for longer than max_age should be removed."""
+        from nemlig_shopper.config import prune_cache_dir
+
+        fresh = self._write(tmp_path, "fresh", 10)
+        stale = self._write(tmp_path, "stale", 1000)
+
+        prune_cache_dir(tmp_path, max_age=100)
+
+        assert fresh.exists()
+        assert not stale.exists()
+
+    def test_removes_least_recently_used_beyond_limit(self, tmp_path):
+        """Only the most recently used max_entries files should be kept."""
+        from nemlig_shopper.config import prune_cache_dir
+
+        newest = self._write(tmp_path, "newest", 1)
+        middle = self._write(tmp_path, "middle", 2)
+        oldest = self._write(tmp_path, "oldest", 3)
+
+        prune_cache_dir(tmp_path, max_age=100, max_entries=2)
+
+        assert newest.exists()
+        assert middle.exists()
+        assert not oldest.exists()
+
+    def test_missing_directory(self, tmp_path):
+        """A cache directory that doesn't exist yet should be ignored."""
+        from nemlig_shopper.config import prune_cache_dir
+
+        prune_cache_dir(tmp_path / "missing", max_age=100)
+
+
 # ============================================================================
 # Integration Tests
 # ============================================================================
@@ -1,12 +1,21 @@
 """Unit tests for the recipe_parser module."""
 
+import json
+from unittest.mock import patch
+
+from bs4 import BeautifulSoup
+
+from nemlig_shopper.config import clear_recipe_cache
 from nemlig_shopper.recipe_parser import (
     Ingredient,
     Recipe,
+    _extract_json_ld_recipe,
+    _extract_nuxt3_payload,
     parse_ingredient_text,
     parse_ingredients_text,
     parse_quantity,
     parse_recipe_text,
+    parse_recipe_url,
     parse_unit,
 )
 
@@ -321,3 +330,119 @@ class TestParseRecipeText:
         ingredients = "2 cups flour"
         recipe = parse_recipe_text("Simple Recipe", ingredients)
         assert recipe.servings is None
+
+
+class TestEmbeddedRecipeData:
+    """Tests for extracting recipe data embedded in page scripts."""
+
+    def test_extract_json_ld_recipe(self):
+        html = (
+            '<script type="application/ld+json">'
+            '{"@type": "Recipe", "name": "Lasagne", "recipeIngredient": ["500 g oksekød"]}'
+            "</script>"
+        )
+
+        data = _extract_json_ld_recipe(BeautifulSoup(html, "html.parser"))
+
+        assert data is not None
+        assert data["name"] == "Lasagne"
+        assert data["recipeIngredient"] == ["500 g oksekød"]
+
+    def test_extract_json_ld_recipe_from_graph(self):
+        html = (
+            '<script type="application/ld+json">'
+            '{"@graph": [{"@type": "WebPage"}, {"@type": "Recipe", "name": "Suppe"}]}'
+            "</script>"
+        )
+
+        data = _extract_json_ld_recipe(BeautifulSoup(html, "html.parser"))
+
+        assert data == {"@type": "Recipe", "name": "Suppe"}
+
+    def test_extract_nuxt3_payload(self):
+        payload = '[{"ingredient": 1, "amountOfContent": 2, "unitOfContent": 3}, "mælk", 5, "dl"]'
+        html = f'<script id="__NUXT_DATA__" type="application/json">{payload}</script>'
+
+        ingredients = _extract_nuxt3_payload(BeautifulSoup(html, "html.parser"))
+
+        assert ingredients is not None
+        assert len(ingredients) == 1
+        assert ingredients[0].name == "mælk"
+        assert ingredients[0].quantity == 5.0
+        assert ingredients[0].unit == "dl"
+
+
+class TestRecipeCache:
+    """Tests for the on-disk parse_recipe_url cache."""
+
+    URL = "https://example.com/lasagne"
+
+    def _recipe(self):
+        return Recipe(
+            title="Lasagne",
+            ingredients=[parse_ingredient_text("500 g hakket oksekød")],
+            servings=4,
+            source_url=self.URL,
+        )
+
+    def test_repeat_parse_uses_cache(self):
+        with patch(
+            "nemlig_shopper.recipe_parser._scrape_recipe", return_value=self._recipe()
+        ) as scrape:
+            first = parse_recipe_url(self.URL)
+            second = parse_recipe_url(self.URL)
+
+        assert scrape.call_count == 1
+        assert second.to_dict() == first.to_dict()
+
+    def test_no_cache_refetches(self):
+        with patch(
+            "nemlig_shopper.recipe_parser._scrape_recipe", return_value=self._recipe()
+        ) as scrape:
+            parse_recipe_url(self.URL)
+            parse_recipe_url(self.URL, use_cache=False)
+
+        assert scrape.call_count == 2
+
+    def test_expired_entries_are_refetched(self, monkeypatch):
+        monkeypatch.setattr("nemlig_shopper.recipe_parser.RECIPE_CACHE_TTL", -1)
+        with patch(
+            "nemlig_shopper.recipe_parser._scrape_recipe", return_value=self._recipe()
+        ) as scrape:
+            parse_recipe_url(self.URL)
+            parse_recipe_url(self.URL)
+
+        assert scrape.call_count == 2
+
+    def test_expired_entries_are_removed(self, isolated_cache):
+        with patch("nemlig_shopper.recipe_parser._scrape_recipe", return_value=self._recipe()):
+            parse_recipe_url(self.URL)
+        [path] = (isolated_cache / "recipes").glob("*.json")
+        data = json.loads(path.read_text())
+        data["cached_at"] -= 8 * 24 * 60 * 60
+        path.write_text(json.dumps(data))
+
+        # An empty re-parse is not cached, so only the expiry check removes the file
+        empty = Recipe(title="Unknown Recipe", ingredients=[], source_url=self.URL)
+        with patch("nemlig_shopper.recipe_parser._scrape_recipe", return_value=empty):
+            parse_recipe_url(self.URL)
+
+        assert not path.exists()
+
+    def test_recipes_without_ingredients_are_not_cached(self):
+        empty = Recipe(title="Unknown Recipe", ingredients=[], source_url=self.URL)
+        with patch("nemlig_shopper.recipe_parser._scrape_recipe", return_value=empty) as scrape:
+            parse_recipe_url(self.URL)
+            parse_recipe_url(self.URL)
+
+        assert scrape.call_count == 2
+
+    def test_clear_recipe_cache(self):
+        with patch(
+            "nemlig_shopper.recipe_parser._scrape_recipe", return_value=self._recipe()
+        ) as scrape:
+            parse_recipe_url(self.URL)
+            clear_recipe_cache()
+            parse_recipe_url(self.URL)
+
+        assert scrape.call_count == 2